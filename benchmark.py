@@ -0,0 +1,608 @@
+# benchmark.py - Offline benchmark and regression suite for the ingest and query paths
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain.schema import Document
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import chat_manager
+import vector_store
+from chat_manager import add_message_to_history, get_chat_history
+from document_processor import process_document, supported_extensions
+from vector_store import load_vectorstore, save_vectorstore, search_documents
+
+# Same dimensionality as the default OpenAI embedding model
+EMBEDDING_SIZE = 1536
+
+DEFAULT_SIZES = [100, 1000, 5000]
+DEFAULT_THRESHOLD = 0.25
+
+VOCABULARY = [
+    "contract", "liability", "agreement", "party", "clause", "termination", "payment",
+    "invoice", "delivery", "warranty", "damages", "breach", "notice", "confidential",
+    "license", "property", "employee", "schedule", "obligation", "jurisdiction",
+    "arbitration", "indemnity", "renewal", "period", "service", "customer", "supplier",
+    "document", "report", "analysis", "system", "question", "answer", "retrieval",
+]
+
+QUERIES = [
+    "What are the termination conditions of the agreement?",
+    "Who is liable for damages in case of breach?",
+    "When is payment due after delivery?",
+    "How long is the confidentiality period?",
+]
+
+
+# ---------------------------------------------------------------------------
+# Offline stand-ins for the OpenAI models
+# ---------------------------------------------------------------------------
+
+def fake_embeddings(api_key: Optional[str] = None):
+    """Deterministic embeddings that never leave the process."""
+    return DeterministicFakeEmbedding(size=EMBEDDING_SIZE)
+
+
+def fake_llm(api_key: str, temperature: float = 0.1, latency: float = 0.0):
+    """Chat model returning canned answers after an optional simulated delay."""
+    return FakeListChatModel(
+        responses=["This is a synthetic answer produced for benchmarking."],
+        sleep=latency or None,
+    )
+
+
+def install_fakes(llm_latency: float = 0.0):
+    """Route every embedding and LLM call in the app to the offline stand-ins."""
+    vector_store.get_embeddings = fake_embeddings
+    chat_manager.get_llm = lambda api_key, temperature=0.1: fake_llm(api_key, temperature, llm_latency)
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus generation
+# ---------------------------------------------------------------------------
+
+def make_paragraphs(rng: random.Random, count: int, sentences: int = 6) -> List[str]:
+    """Generate pseudo-random paragraphs from a fixed vocabulary."""
+    paragraphs = []
+    for _ in range(count):
+        words = []
+        for _ in range(sentences):
+            sentence = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(8, 16)))
+            words.append(sentence.capitalize() + ".")
+        paragraphs.append(" ".join(words))
+    return paragraphs
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_txt(path: str, paragraphs: List[str]):
+    with open(path, "w") as f:
+        f.write("\n\n".join(paragraphs))
+
+
+def write_csv(path: str, paragraphs: List[str]):
+    with open(path, "w") as f:
+        f.write("id,title,body\n")
+        for i, paragraph in enumerate(paragraphs):
+            f.write(f'{i},Row {i},"{paragraph}"\n')
+
+
+def write_docx(path: str, paragraphs: List[str]):
+    """Write a minimal WordprocessingML package readable by python-docx."""
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", content_types)
+        z.writestr("_rels/.rels", rels)
+        z.writestr("word/document.xml", document)
+
+
+def write_pdf(path: str, paragraphs: List[str], lines_per_page: int = 50, line_width: int = 90):
+    """Write a plain-text PDF with one Helvetica content stream per page."""
+    lines = []
+    for paragraph in paragraphs:
+        words, current = paragraph.split(), ""
+        for word in words:
+            if len(current) + len(word) + 1 > line_width:
+                lines.append(current)
+                current = word
+            else:
+                current = f"{current} {word}".strip()
+        lines.extend([current, ""])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[""]]
+
+    # Object numbers: 1 catalog, 2 pages, 3 font, then (page, content) pairs
+    objects = {3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for i, page_lines in enumerate(pages):
+        page_num, content_num = 4 + 2 * i, 5 + 2 * i
+        kids.append(f"{page_num} 0 R")
+        text = "BT /F1 10 Tf 14 TL 50 760 Td " + " ".join(f"({_pdf_escape(l)}) Tj T*" for l in page_lines) + " ET"
+        stream = text.encode("latin-1")
+        objects[content_num] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_num] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_num} 0 R >>"
+        ).encode()
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for num in sorted(objects):
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, objects[num])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for num in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[num]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+
+WRITERS = {"txt": write_txt, "csv": write_csv, "docx": write_docx, "pdf": write_pdf}
+
+
+def generate_corpus(directory: str, paragraphs_per_file: int = 200, seed: int = 42) -> Dict[str, str]:
+    """
+    Generate one synthetic document per supported format.
+
+    Args:
+        directory: Directory to write the files into
+        paragraphs_per_file: Number of paragraphs in each document
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        Mapping of file extension to file path
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    files = {}
+    for extension in supported_extensions:
+        path = os.path.join(directory, f"synthetic.{extension}")
+        WRITERS[extension](path, make_paragraphs(rng, paragraphs_per_file))
+        files[extension] = path
+    return files
+
+
+def synthetic_chunks(count: int, seed: int = 42) -> List[Document]:
+    """Generate chunk-sized documents for building indexes of a given size."""
+    rng = random.Random(seed)
+    return [
+        Document(page_content=p, metadata={"source": f"synthetic_{i // 50}.txt", "page": i % 50})
+        for i, p in enumerate(make_paragraphs(rng, count))
+    ]
+
+
+def usable_files(files: Dict[str, str]) -> Dict[str, str]:
+    """Drop formats whose loader cannot run here (e.g. unstructured missing its NLP models)."""
+    usable = {}
+    for extension, path in files.items():
+        try:
+            process_document(path)
+            usable[extension] = path
+        except Exception as e:
+            print(f"Skipping {extension}: loader failed ({type(e).__name__}: {str(e)[:200]})")
+    return usable
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+def time_call(fn: Callable[[], Any], repeats: int, warmup: int = 1,
+              setup: Optional[Callable[[], Any]] = None) -> List[float]:
+    """Run fn warmup + repeats times and return the timed durations in seconds.
+
+    If given, setup runs untimed before every call.
+    """
+    durations = []
+    for i in range(warmup + repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        if i >= warmup:
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    ordered = sorted(durations)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "p50": statistics.median(ordered),
+        "p95": ordered[p95_index],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def metric(value: float, unit: str, higher_is_better: bool = False) -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def add_latency(results: Dict[str, Any], name: str, durations: List[float]):
+    for stat, value in summarize(durations).items():
+        results[f"{name}.{stat}"] = metric(value, "s")
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_ingest(files: Dict[str, str], repeats: int) -> Dict[str, Any]:
+    """Loader + splitter throughput per format, followed by embedding into a fresh index."""
+    results = {}
+    for extension, path in files.items():
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        chunks = process_document(path)
+        durations = time_call(lambda: process_document(path), repeats)
+        p50 = statistics.median(durations)
+        results[f"ingest.{extension}.process.p50"] = metric(p50, "s")
+        results[f"ingest.{extension}.chunks_per_sec"] = metric(len(chunks) / p50, "chunks/s", True)
+        results[f"ingest.{extension}.mb_per_sec"] = metric(size_mb / p50, "MB/s", True)
+
+        embed = time_call(lambda: FAISS.from_documents(chunks, fake_embeddings()), repeats)
+        results[f"ingest.{extension}.index.p50"] = metric(statistics.median(embed), "s")
+    return results
+
+
+def bench_index(sizes: List[int], repeats: int, workdir: str, k: int = 5) -> Dict[str, Any]:
+    """Index save/load time and retrieval latency at several corpus sizes."""
+    results = {}
+    for size in sizes:
+        store = FAISS.from_documents(synthetic_chunks(size), fake_embeddings())
+        directory = os.path.join(workdir, f"index_{size}")
+
+        add_latency(results, f"index.save.{size}", time_call(lambda: save_vectorstore(store, directory), repeats))
+        add_latency(results, f"index.load.{size}", time_call(lambda: load_vectorstore(directory), repeats))
+
+        queries = iter(QUERIES * (repeats + 1))
+        add_latency(
+            results,
+            f"retrieval.{size}",
+            time_call(lambda: search_documents(next(queries), store, k=k), repeats),
+        )
+    return results
+
+
+def bench_history(lengths: List[int], repeats: int, workdir: str) -> Dict[str, Any]:
+    """Read and append latency for chat histories of increasing length."""
+    results = {}
+    history_dir = os.path.join(workdir, "history")
+    os.makedirs(history_dir, exist_ok=True)
+    rng = random.Random(7)
+    for length in lengths:
+        chat_id = f"bench-{length}"
+        for i in range(length):
+            role = "user" if i % 2 == 0 else "assistant"
+            add_message_to_history(chat_id, role, make_paragraphs(rng, 1)[0], history_dir)
+
+        add_latency(
+            results,
+            f"history.read.{length}",
+            time_call(lambda: get_chat_history(chat_id, history_dir, max_history=3), repeats),
+        )
+        add_latency(
+            results,
+            f"history.append.{length}",
+            time_call(lambda: add_message_to_history(chat_id, "user", "benchmark", history_dir), repeats),
+        )
+    return results
+
+
+def bench_api(files: Dict[str, str], sizes: List[int], repeats: int) -> Dict[str, Any]:
+    """End-to-end request latency through the FastAPI app using the in-process test client."""
+    from fastapi.testclient import TestClient
+
+    main = importlib.import_module("main")
+    results = {}
+
+    with TestClient(main.app) as client:
+        # The index is written by the startup load; wait for it before replacing it
+        response = client.get("/health")
+        while response.status_code != 200:
+            if "failed to load" in response.text:
+                raise RuntimeError(f"Vector store did not become ready: {response.text}")
+            time.sleep(0.001)
+            response = client.get("/health")
+
+        for extension, path in files.items():
+            with open(path, "rb") as f:
+                payload = f.read()
+            name = os.path.basename(path)
+
+            def upload():
+                response = client.post("/upload", files={"file": (name, payload)})
+                response.raise_for_status()
+
+            def reset_index():
+                # Upload into an empty index every time, so the timing does not
+                # depend on --repeats or on how many formats were uploaded before
+                main.store_index(vector_store.get_vectorstore([]))
+
+            add_latency(results, f"api.upload.{extension}", time_call(upload, repeats, setup=reset_index))
+
+        for size in sizes:
+            save_vectorstore(FAISS.from_documents(synthetic_chunks(size), fake_embeddings()), main.VECTOR_STORE_DIR)
+            queries = iter(QUERIES * (repeats + 1))
+            chat_id = f"bench-api-{size}"
+
+            def query():
+                response = client.post("/query", json={"query": next(queries), "chat_id": chat_id})
+                response.raise_for_status()
+
+            add_latency(results, f"api.query.{size}", time_call(query, repeats))
+    return results
+
+
+# Seconds a fresh interpreter may take to import main.py and report ready
+STARTUP_TIMEOUT = 120
+
+STARTUP_SCRIPT = """
+import json, os, sys, time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+import vector_store
+
+def embeddings(api_key=None):
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    return DeterministicFakeEmbedding(size=%d)
+
+vector_store.get_embeddings = embeddings
+deadline = time.perf_counter() + %d
+with TestClient(main.app) as client:
+    while True:
+        response = client.get("/health")
+        if response.status_code == 200:
+            break
+        if "failed to load" in response.text or time.perf_counter() > deadline:
+            sys.exit(f"Vector store did not become ready: {response.text}")
+        time.sleep(0.001)
+    ready = time.perf_counter()
+print(json.dumps({"import": imported - start, "ready": ready - start}))
+""" % (EMBEDDING_SIZE, STARTUP_TIMEOUT)
+
+
+def bench_startup(sizes: List[int], repeats: int, workdir: str) -> Dict[str, Any]:
+    """
+    Cold import time of main.py (including fastapi) and time until /health reports
+    ready, each measured in a fresh interpreter.
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for size in [0] + sizes[-1:]:
+        label = "empty" if size == 0 else str(size)
+        imports, ready = [], []
+        for i in range(repeats):
+            cwd = os.path.join(workdir, f"startup_{label}_{i}")
+            os.makedirs(cwd)
+            if size:
+                store = FAISS.from_documents(synthetic_chunks(size), fake_embeddings())
+                save_vectorstore(store, os.path.join(cwd, "vector_store"))
+            output = subprocess.run(
+                [sys.executable, "-c", STARTUP_SCRIPT], cwd=cwd, env=env,
+                capture_output=True, text=True, check=True, timeout=STARTUP_TIMEOUT + 30,
+            ).stdout
+            timings = json.loads(output.strip().splitlines()[-1])
+            imports.append(timings["import"])
+            ready.append(timings["ready"])
+        add_latency(results, f"startup.import_main.{label}", imports)
+        add_latency(results, f"startup.ready.{label}", ready)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare metrics against a baseline run.
+
+    Args:
+        current: Metrics from this run
+        baseline: Metrics from the stored baseline
+        threshold: Allowed relative slowdown before a metric is flagged
+
+    Returns:
+        List of regressed metrics with their baseline and current values. Baseline
+        metrics missing from this run are included with a current value of None.
+    """
+    regressions = []
+    for name, base in baseline.items():
+        # Tail and mean latencies are too noisy at small repeat counts to gate on
+        if name.endswith((".p95", ".mean")):
+            continue
+        entry = current.get(name)
+        if entry is None:
+            regressions.append({
+                "metric": name,
+                "baseline": base["value"],
+                "current": None,
+                "unit": base["unit"],
+                "change": None,
+            })
+            continue
+        if not base["value"]:
+            continue
+        change = (entry["value"] - base["value"]) / base["value"]
+        if entry["higher_is_better"]:
+            change = -change
+        if change > threshold:
+            regressions.append({
+                "metric": name,
+                "baseline": base["value"],
+                "current": entry["value"],
+                "unit": entry["unit"],
+                "change": change,
+            })
+    return regressions
+
+
+def config_differences(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """List the run settings that differ between this run and the baseline."""
+    return [
+        f"{key}: baseline {baseline.get(key)!r}, current {current.get(key)!r}"
+        for key in sorted(set(current) | set(baseline))
+        if current.get(key) != baseline.get(key)
+    ]
+
+
+def run(args, workdir: str) -> Dict[str, Any]:
+    install_fakes(args.llm_latency)
+    # Keep main.py importable after leaving the repository directory
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # main.py resolves its storage directories relative to the working directory
+    os.chdir(workdir)
+
+    files = generate_corpus(os.path.join(workdir, "corpus"), args.paragraphs)
+    files = usable_files({ext: files[ext] for ext in args.formats})
+    metrics = {}
+    print("Benchmarking ingest...")
+    metrics.update(bench_ingest(files, args.repeats))
+    print("Benchmarking index save/load and retrieval...")
+    metrics.update(bench_index(args.sizes, args.repeats, workdir))
+    print("Benchmarking chat history I/O...")
+    metrics.update(bench_history(args.history_lengths, args.repeats, workdir))
+    if not args.skip_api:
+        print("Benchmarking API end-to-end...")
+        metrics.update(bench_api(files, args.sizes, args.repeats))
+        print("Benchmarking startup...")
+        metrics.update(bench_startup(args.sizes, min(args.repeats, 5), workdir))
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "sizes": args.sizes,
+            "formats": sorted(files),
+            "repeats": args.repeats,
+            "paragraphs": args.paragraphs,
+            "history_lengths": args.history_lengths,
+            "llm_latency": args.llm_latency,
+            "skip_api": args.skip_api,
+        },
+        "metrics": metrics,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for the RAG ingest and query paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Number of chunks in the index for retrieval and query benchmarks")
+    parser.add_argument("--repeats", type=int, default=10, help="Timed repetitions per measurement")
+    parser.add_argument("--formats", nargs="+", default=supported_extensions, choices=supported_extensions,
+                        help="Document formats to generate and ingest")
+    parser.add_argument("--paragraphs", type=int, default=200, help="Paragraphs per synthetic document")
+    parser.add_argument("--history-lengths", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Chat history lengths to benchmark")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated LLM latency in seconds")
+    parser.add_argument("--skip-api", action="store_true", help="Skip the end-to-end FastAPI benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change that counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results to --baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    cwd = os.getcwd()
+    output = os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    workdir = tempfile.mkdtemp(prefix="rag_bench_")
+    try:
+        results = run(args, workdir)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if not baseline_path:
+        return 0
+
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+
+    # Runs with different sizes, repeats or formats are not comparable
+    differences = config_differences(results["config"], baseline.get("config", {}))
+    if differences:
+        print(f"Run configuration differs from {baseline_path}:")
+        for difference in differences:
+            print(f"  {difference}")
+
+    regressions = compare(results["metrics"], baseline["metrics"], args.threshold)
+    if not regressions and not differences:
+        print(f"No regressions beyond {args.threshold:.0%} against {baseline_path}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for r in regressions:
+        if r["current"] is None:
+            print(f"  {r['metric']}: missing from this run (baseline {r['baseline']:.6g} {r['unit']})")
+        else:
+            print(f"  {r['metric']}: {r['baseline']:.6g} -> {r['current']:.6g} {r['unit']} ({r['change']:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,18 @@
 # chat_manager.py - Chat history and LLM integration
-from langchain_openai import ChatOpenAI
-from langchain.chains import ConversationalRetrievalChain
-from langchain_community.chat_message_histories import ChatMessageHistory
-from langchain.memory import ConversationBufferMemory
-from langchain_community.vectorstores import FAISS
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, TYPE_CHECKING
 import os
 import json
 from datetime import datetime
 
+# langchain and the OpenAI client are imported on first use to keep startup fast
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
 
 def get_llm(api_key: str, temperature: float = 0.1):
     """Get OpenAI chat model."""
+    from langchain_openai import ChatOpenAI
+
     return ChatOpenAI(
         openai_api_key=api_key,
         temperature=temperature,
@@ -96,7 +97,7 @@ def format_chat_history(history: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
     return formatted_history
 
 
-def get_answer(query: str, vectorstore: FAISS, chat_history: List[Dict[str, Any]], api_key: str) -> Tuple[
+def get_answer(query: str, vectorstore: "FAISS", chat_history: List[Dict[str, Any]], api_key: str) -> Tuple[
     str, List[Dict[str, Any]]]:
     """
     Get answer for a query using RAG.
@@ -110,6 +111,10 @@ def get_answer(query: str, vectorstore: FAISS, chat_history: List[Dict[str, Any]
     Returns:
         Answer and source documents
     """
+    from langchain.chains import ConversationalRetrievalChain
+    from langchain.memory import ConversationBufferMemory
+    from langchain_community.chat_message_histories import ChatMessageHistory
+
     llm = get_llm(api_key)
 
     # Format chat history for the retrieval chain
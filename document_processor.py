@@ -1,11 +1,4 @@
 # document_processor.py - Document processing utilities
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredWordDocumentLoader,
-    CSVLoader
-)
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from typing import List
 import os
 
@@ -14,16 +7,25 @@ supported_extensions = ["pdf", "txt", "docx", "csv"]
 
 
 def get_loader(file_path: str):
-    """Get the appropriate document loader based on file extension."""
+    """
+    Get the appropriate document loader based on file extension.
+
+    Loaders are imported per file type so that heavy dependencies (e.g. unstructured
+    for DOCX) are only loaded when a document of that type is processed.
+    """
     extension = file_path.split(".")[-1].lower()
 
     if extension == "pdf":
+        from langchain_community.document_loaders import PyPDFLoader
         return PyPDFLoader(file_path)
     elif extension == "txt":
+        from langchain_community.document_loaders import TextLoader
         return TextLoader(file_path)
     elif extension == "docx":
+        from langchain_community.document_loaders import UnstructuredWordDocumentLoader
         return UnstructuredWordDocumentLoader(file_path)
     elif extension == "csv":
+        from langchain_community.document_loaders import CSVLoader
         return CSVLoader(file_path)
     else:
         raise ValueError(f"Unsupported file format: {extension}")
@@ -48,6 +50,8 @@ def process_document(file_path: str):
         doc.metadata["source"] = os.path.basename(file_path)
 
     # Split document into chunks
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=1000,
         chunk_overlap=200,
@@ -1,18 +1,20 @@
 # main.py - FastAPI application
 from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+import asyncio
 import os
-import uvicorn
+import time
 from dotenv import load_dotenv
 import uuid
 from datetime import datetime
 import json
 
-# Import helper modules
+# Import helper modules (langchain, FAISS and OpenAI are imported lazily inside them)
 from document_processor import process_document, supported_extensions
-from vector_store import get_vectorstore, save_vectorstore, load_vectorstore
+from vector_store import get_vectorstore, save_vectorstore, load_vectorstore, remove_placeholder
 from chat_manager import get_answer, add_message_to_history, get_chat_history
 
 # Load environment variables
@@ -21,7 +23,109 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY not found in .env file")
 
-app = FastAPI(title="RAG Question-Answering System")
+# Storage paths
+UPLOAD_DIR = "uploads"
+VECTOR_STORE_DIR = "vector_store"
+CHAT_HISTORY_DIR = "chat_history"
+
+# In-memory vector store shared by all requests, filled in by the lifespan hook
+index_state: Dict[str, Any] = {
+    "vectorstore": None,
+    "task": None,
+    "mtime": None,
+    "error": None,
+    "started_at": None,
+    "ready_seconds": None,
+}
+
+
+def _index_mtime() -> Optional[float]:
+    index_file = os.path.join(VECTOR_STORE_DIR, "index.faiss")
+    return os.path.getmtime(index_file) if os.path.exists(index_file) else None
+
+
+def initialize_vectorstore():
+    """Load the vector store from disk, or create an empty one locally if none exists."""
+    if _index_mtime() is None:
+        print("Initializing empty vector store...")
+        vectorstore = get_vectorstore([])
+        save_vectorstore(vectorstore, VECTOR_STORE_DIR)
+        print("Empty vector store initialized.")
+    else:
+        vectorstore = load_vectorstore(VECTOR_STORE_DIR)
+        if remove_placeholder(vectorstore):
+            save_vectorstore(vectorstore, VECTOR_STORE_DIR)
+            print("Removed placeholder document from vector store.")
+        print("Vector store found.")
+    return vectorstore, _index_mtime()
+
+
+async def _load_index():
+    try:
+        vectorstore, mtime = await asyncio.to_thread(initialize_vectorstore)
+    except Exception as e:
+        # Never replace an index we could not read: uploads and queries are refused
+        # until the files on disk are fixed or removed, which triggers a new load.
+        index_state["error"] = str(e)
+        index_state["mtime"] = _index_mtime()
+        print(f"ERROR: could not load vector store from '{VECTOR_STORE_DIR}': {str(e)}")
+        print("Uploads and queries will be refused until the index is repaired or removed.")
+        return
+    index_state["vectorstore"] = vectorstore
+    index_state["mtime"] = mtime
+    index_state["ready_seconds"] = time.perf_counter() - index_state["started_at"]
+    print(f"Vector store ready in {index_state['ready_seconds']:.2f}s")
+
+
+def start_index_load():
+    """Create the storage directories and start loading the vector store in the background."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
+    os.makedirs(CHAT_HISTORY_DIR, exist_ok=True)
+
+    index_state["vectorstore"] = None
+    index_state["error"] = None
+    index_state["ready_seconds"] = None
+    index_state["started_at"] = time.perf_counter()
+    index_state["task"] = asyncio.create_task(_load_index())
+
+
+async def get_index():
+    """Return the shared vector store, waiting for startup and reloading if another worker saved it."""
+    # Without the lifespan hook (e.g. a TestClient used outside `with`), load on first use
+    if index_state["task"] is None:
+        start_index_load()
+    await index_state["task"]
+    mtime = _index_mtime()
+    if index_state["error"] is not None and mtime != index_state["mtime"]:
+        # The broken index was replaced or removed on disk; try again
+        start_index_load()
+        await index_state["task"]
+        mtime = _index_mtime()
+    if index_state["error"] is not None:
+        raise HTTPException(status_code=503, detail=f"Vector store failed to load: {index_state['error']}")
+    if mtime is not None and mtime != index_state["mtime"]:
+        index_state["vectorstore"] = await asyncio.to_thread(load_vectorstore, VECTOR_STORE_DIR)
+        index_state["mtime"] = mtime
+    return index_state["vectorstore"]
+
+
+def store_index(vectorstore):
+    save_vectorstore(vectorstore, VECTOR_STORE_DIR)
+    index_state["vectorstore"] = vectorstore
+    index_state["mtime"] = _index_mtime()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the index in the background so the server can report readiness while it loads
+    start_index_load()
+    yield
+    index_state["task"].cancel()
+    index_state["task"] = None
+
+
+app = FastAPI(title="RAG Question-Answering System", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -49,39 +153,35 @@ class ChatHistory(BaseModel):
     messages: List[Dict[str, Any]]
 
 
-# Storage paths
-UPLOAD_DIR = "uploads"
-VECTOR_STORE_DIR = "vector_store"
-CHAT_HISTORY_DIR = "chat_history"
-
-# Create necessary directories if they don't exist
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
-os.makedirs(CHAT_HISTORY_DIR, exist_ok=True)
-
-# Initialize vector store if it doesn't exist
-try:
-    # Try to load existing vector store
-    if os.path.exists(os.path.join(VECTOR_STORE_DIR, "index.faiss")):
-        print("Vector store found.")
-    else:
-        print("Initializing empty vector store...")
-        vectorstore = get_vectorstore([])
-        save_vectorstore(vectorstore, VECTOR_STORE_DIR)
-        print("Empty vector store initialized.")
-except Exception as e:
-    print(f"Error initializing vector store: {str(e)}")
-    # Create a fresh empty vector store
-    print("Creating a fresh vector store...")
-    vectorstore = get_vectorstore([])
-    save_vectorstore(vectorstore, VECTOR_STORE_DIR)
-
-
 @app.get("/")
 async def root():
     return {"message": "RAG Question-Answering System API"}
 
 
+@app.get("/health")
+async def health():
+    task = index_state["task"]
+    if task is None:
+        start_index_load()
+        task = index_state["task"]
+    if task.done() and index_state["error"] is not None and _index_mtime() != index_state["mtime"]:
+        # The broken index was replaced or removed on disk; try again
+        start_index_load()
+        task = index_state["task"]
+    if not task.done():
+        raise HTTPException(status_code=503, detail="Vector store is still loading")
+    if index_state["error"] is not None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Vector store failed to load: {index_state['error']}"
+        )
+    return {
+        "status": "ready",
+        "documents": index_state["vectorstore"].index.ntotal,
+        "ready_seconds": index_state["ready_seconds"],
+    }
+
+
 @app.post("/upload", status_code=201)
 async def upload_document(file: UploadFile = File(...)):
     # Check file extension
@@ -95,6 +195,7 @@ async def upload_document(file: UploadFile = File(...)):
     # Save file
     file_path = os.path.join(UPLOAD_DIR, file.filename)
     try:
+        vectorstore = await get_index()
         with open(file_path, "wb") as f:
             content = await file.read()
             f.write(content)
@@ -102,13 +203,14 @@ async def upload_document(file: UploadFile = File(...)):
         # Process document immediately
         docs = process_document(file_path)
         if docs:
-            vectorstore = load_vectorstore(VECTOR_STORE_DIR)
             vectorstore.add_documents(docs)
-            save_vectorstore(vectorstore, VECTOR_STORE_DIR)
+            store_index(vectorstore)
             print(f"Document '{file_path}' processed and added to vector store")
             return {"message": f"File '{file.filename}' uploaded and processed successfully"}
         else:
             return {"message": f"File '{file.filename}' uploaded but no content was extracted"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -119,8 +221,12 @@ async def upload_document(file: UploadFile = File(...)):
 @app.post("/query", response_model=QueryResponse)
 async def query(request: QueryRequest):
     try:
-        # Load vector store
-        vectorstore = load_vectorstore(VECTOR_STORE_DIR)
+        vectorstore = await get_index()
+        if vectorstore.index.ntotal == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="No documents have been uploaded yet. Please upload documents first."
+            )
 
         chat_id = request.chat_id
         if not chat_id:
@@ -142,6 +248,8 @@ async def query(request: QueryRequest):
             "chat_id": chat_id,
             "sources": sources
         }
+    except HTTPException:
+        raise
     except Exception as e:
         if "no docs in retriever" in str(e).lower():
             raise HTTPException(
@@ -163,32 +271,7 @@ async def get_chat(chat_id: str):
         raise HTTPException(status_code=404, detail="Chat history not found")
 
 
-def process_and_update_vectorstore(file_path: str):
-    try:
-        # Process document
-        docs = process_document(file_path)
-
-        if not docs:
-            print(f"No content extracted from document '{file_path}'")
-            return
-
-        try:
-            # Try to load existing vector store
-            vectorstore = load_vectorstore(VECTOR_STORE_DIR)
-            # Add new documents to vector store
-            vectorstore.add_documents(docs)
-        except Exception as e:
-            print(f"Error loading existing vector store: {str(e)}")
-            # Create new vector store with documents
-            vectorstore = get_vectorstore(docs)
-
-        # Save updated vector store
-        save_vectorstore(vectorstore, VECTOR_STORE_DIR)
-
-        print(f"Document '{file_path}' processed and added to vector store")
-    except Exception as e:
-        print(f"Error processing document '{file_path}': {str(e)}")
-
-
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,149 @@
+# test_main.py - Startup, readiness and index recovery tests for the FastAPI app
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import chat_manager
+import main
+import vector_store
+from benchmark import fake_embeddings, fake_llm
+from vector_store import PLACEHOLDER_SOURCE, get_vectorstore, load_vectorstore, remove_placeholder, save_vectorstore
+
+
+def make_docs(count: int):
+    return [Document(page_content=f"Clause {i} covers payment terms.", metadata={"source": "a.txt"}) for i in range(count)]
+
+
+def wait_until_loaded(client: TestClient, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get("/health")
+        if "still loading" not in response.text:
+            return response
+        time.sleep(0.01)
+    raise AssertionError("vector store did not finish loading")
+
+
+@pytest.fixture(autouse=True)
+def workspace(tmp_path, monkeypatch):
+    """Run each test in an empty directory with offline embeddings and LLM."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(vector_store, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(chat_manager, "get_llm", fake_llm)
+    monkeypatch.setitem(main.index_state, "task", None)
+    return tmp_path
+
+
+def test_empty_store_is_created_without_embedding_calls(monkeypatch):
+    class NoCallEmbeddings(type(fake_embeddings())):
+        def embed_documents(self, texts):
+            raise AssertionError("embedding call during startup")
+
+        def embed_query(self, text):
+            raise AssertionError("embedding call during startup")
+
+    monkeypatch.setattr(vector_store, "get_embeddings", lambda api_key=None: NoCallEmbeddings(size=8))
+
+    with TestClient(main.app) as client:
+        response = wait_until_loaded(client)
+        assert response.status_code == 200
+        assert response.json()["documents"] == 0
+        assert os.path.exists(os.path.join(main.VECTOR_STORE_DIR, "index.faiss"))
+
+        response = client.post("/query", json={"query": "What are the payment terms?"})
+        assert response.status_code == 400
+        assert "No documents have been uploaded" in response.json()["detail"]
+
+
+def test_health_reports_loading_until_index_is_ready(monkeypatch):
+    release = threading.Event()
+    initialize = main.initialize_vectorstore
+
+    def slow_initialize():
+        release.wait(10)
+        return initialize()
+
+    monkeypatch.setattr(main, "initialize_vectorstore", slow_initialize)
+
+    with TestClient(main.app) as client:
+        response = client.get("/health")
+        assert response.status_code == 503
+        assert "still loading" in response.json()["detail"]
+
+        release.set()
+        response = wait_until_loaded(client)
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+
+def test_failed_load_refuses_requests_and_keeps_index():
+    save_vectorstore(get_vectorstore(make_docs(4)), main.VECTOR_STORE_DIR)
+    pkl_path = os.path.join(main.VECTOR_STORE_DIR, "index.pkl")
+    with open(pkl_path, "wb") as f:
+        f.write(b"corrupted")
+
+    with TestClient(main.app) as client:
+        response = wait_until_loaded(client)
+        assert response.status_code == 503
+        assert "failed to load" in response.json()["detail"]
+
+        response = client.post("/upload", files={"file": ("a.txt", b"New document about delivery.")})
+        assert response.status_code == 503
+        response = client.post("/query", json={"query": "What are the payment terms?"})
+        assert response.status_code == 503
+        assert "failed to load" in response.json()["detail"]
+
+    with open(pkl_path, "rb") as f:
+        assert f.read() == b"corrupted"
+
+
+def test_repaired_index_is_loaded_after_failure():
+    save_vectorstore(get_vectorstore(make_docs(4)), main.VECTOR_STORE_DIR)
+    with open(os.path.join(main.VECTOR_STORE_DIR, "index.pkl"), "wb") as f:
+        f.write(b"corrupted")
+
+    with TestClient(main.app) as client:
+        assert wait_until_loaded(client).status_code == 503
+
+        save_vectorstore(get_vectorstore(make_docs(4)), main.VECTOR_STORE_DIR)
+        response = client.post("/query", json={"query": "What are the payment terms?"})
+        assert response.status_code == 200
+        assert client.get("/health").json()["documents"] == 4
+
+
+def test_placeholder_is_removed_on_startup():
+    placeholder = Document(page_content="This is a placeholder document.", metadata={"source": PLACEHOLDER_SOURCE})
+    save_vectorstore(get_vectorstore([placeholder] + make_docs(2)), main.VECTOR_STORE_DIR)
+
+    with TestClient(main.app) as client:
+        response = wait_until_loaded(client)
+        assert response.status_code == 200
+        assert response.json()["documents"] == 2
+
+    sources = [doc.metadata["source"] for doc in load_vectorstore(main.VECTOR_STORE_DIR).docstore._dict.values()]
+    assert PLACEHOLDER_SOURCE not in sources
+
+
+def test_remove_placeholder_skips_missing_docstore_entries():
+    store = get_vectorstore(make_docs(2))
+    missing_id = next(iter(store.index_to_docstore_id.values()))
+    store.docstore.delete([missing_id])
+
+    assert remove_placeholder(store) is False
+
+
+def test_index_saved_by_another_worker_is_reloaded():
+    with TestClient(main.app) as client:
+        assert wait_until_loaded(client).json()["documents"] == 0
+
+        # Simulate another worker writing the index
+        save_vectorstore(get_vectorstore(make_docs(3)), main.VECTOR_STORE_DIR)
+        response = client.post("/query", json={"query": "What are the payment terms?"})
+        assert response.status_code == 200
+        assert client.get("/health").json()["documents"] == 3
@@ -1,33 +1,76 @@
 # vector_store.py - Vector store operations
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain.schema import Document
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import os
 import pickle
 import shutil
 
+# langchain, FAISS and the OpenAI client are imported on first use to keep startup fast
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+
+# Output size of the default OpenAI embedding model (text-embedding-ada-002)
+EMBEDDING_DIMENSION = 1536
+
+# Source of the dummy document older versions used to seed an empty store
+PLACEHOLDER_SOURCE = "initialization"
+
 
 def get_embeddings(api_key: Optional[str] = None):
     """Get OpenAI embeddings model."""
+    from langchain_openai import OpenAIEmbeddings
+
     return OpenAIEmbeddings(openai_api_key=api_key)
 
 
-def get_vectorstore(documents: List[Document], api_key: Optional[str] = None):
-    """Create a new FAISS vector store from documents."""
-    embeddings = get_embeddings(api_key)
+def get_empty_vectorstore(api_key: Optional[str] = None, dimension: int = EMBEDDING_DIMENSION) -> "FAISS":
+    """Create an empty FAISS vector store locally, without any embedding call."""
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
+    return FAISS(
+        embedding_function=get_embeddings(api_key),
+        index=faiss.IndexFlatL2(dimension),
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+    )
 
+
+def get_vectorstore(documents: List["Document"], api_key: Optional[str] = None) -> "FAISS":
+    """Create a new FAISS vector store from documents."""
     # Handle empty documents case (initial setup)
     if not documents:
-        # Create a single dummy document with content
-        dummy_doc = Document(page_content="This is a placeholder document.", metadata={"source": "initialization"})
-        vector_store = FAISS.from_documents([dummy_doc], embeddings)
-        return vector_store
+        return get_empty_vectorstore(api_key)
 
-    return FAISS.from_documents(documents, embeddings)
+    from langchain_community.vectorstores import FAISS
 
+    return FAISS.from_documents(documents, get_embeddings(api_key))
 
-def save_vectorstore(vectorstore: FAISS, directory: str):
+
+def remove_placeholder(vectorstore: "FAISS") -> bool:
+    """
+    Remove the placeholder document left behind by older empty stores.
+
+    Args:
+        vectorstore: FAISS vector store
+
+    Returns:
+        True if a placeholder was found and removed
+    """
+    ids = []
+    for doc_id in vectorstore.index_to_docstore_id.values():
+        # The docstore returns an error string instead of a Document for unknown ids
+        doc = vectorstore.docstore.search(doc_id)
+        if getattr(doc, "metadata", {}).get("source") == PLACEHOLDER_SOURCE:
+            ids.append(doc_id)
+    if not ids:
+        return False
+    vectorstore.delete(ids)
+    return True
+
+
+def save_vectorstore(vectorstore: "FAISS", directory: str):
     """Save FAISS vector store to disk."""
     # Create temp directory for saving
     temp_dir = f"{directory}_temp"
@@ -42,13 +85,15 @@ def save_vectorstore(vectorstore: FAISS, directory: str):
     shutil.move(temp_dir, directory)
 
 
-def load_vectorstore(directory: str, api_key: Optional[str] = None):
+def load_vectorstore(directory: str, api_key: Optional[str] = None) -> "FAISS":
     """Load FAISS vector store from disk."""
+    from langchain_community.vectorstores import FAISS
+
     embeddings = get_embeddings(api_key)
     return FAISS.load_local(directory, embeddings, allow_dangerous_deserialization=True)
 
 
-def search_documents(query: str, vectorstore: FAISS, k: int = 5):
+def search_documents(query: str, vectorstore: "FAISS", k: int = 5):
     """
     Search for relevant documents in the vector store.
 
@@ -60,4 +105,4 @@ def search_documents(query: str, vectorstore: FAISS, k: int = 5):
     Returns:
         List of documents and their similarity scores
     """
-    return vectorstore.similarity_search_with_score(query, k=k)
\ No newline at end of file
+    return vectorstore.similarity_search_with_score(query, k=k)